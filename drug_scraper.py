@@ -142,28 +142,34 @@ def fetch_csv_export() -> Tuple[List[Dict[str, str]], date, Path, bool]:
     return rows, target_date, raw_path, downloaded
 
 
+FDA_COLUMN_MAP: Dict[str, str] = {
+    "Registration Number": "registration_number",
+    "Generic Name": "generic_name",
+    "Brand Name": "brand_name",
+    "Dosage Strength": "dosage_strength",
+    "Dosage Form": "dosage_form",
+    "Pharmacologic Category": "pharmacologic_category",
+    "Manufacturer": "manufacturer",
+    "Country of Origin": "country_of_origin",
+    "Application Type": "application_type",
+    "Issuance Date": "issuance_date",
+    "Expiry Date": "expiry_date",
+    "Product Information": "product_information",
+}
+
+
 def normalize_columns(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
     """Rename raw FDA columns into predictable snake_case keys."""
-    key_map = {
-        "Registration Number": "registration_number",
-        "Generic Name": "generic_name",
-        "Brand Name": "brand_name",
-        "Dosage Strength": "dosage_strength",
-        "Dosage Form": "dosage_form",
-        "Pharmacologic Category": "pharmacologic_category",
-        "Manufacturer": "manufacturer",
-        "Country of Origin": "country_of_origin",
-        "Application Type": "application_type",
-        "Issuance Date": "issuance_date",
-        "Expiry Date": "expiry_date",
-        "Product Information": "product_information",
-    }
+    # Every row shares the export's header, so each column is resolved once.
+    resolved: Dict[str, str] = {}
     out: List[Dict[str, str]] = []
     for r in rows:
         nr: Dict[str, str] = {}
         for k, v in r.items():
-            kk = key_map.get(k, k.lower().replace(" ", "_"))
-            # Map or fallback to a deterministic snake_case key.
+            kk = resolved.get(k)
+            if kk is None:
+                # Map or fallback to a deterministic snake_case key.
+                kk = resolved[k] = FDA_COLUMN_MAP.get(k, k.lower().replace(" ", "_"))
             nr[kk] = v
         out.append(nr)
     return out
@@ -184,6 +190,19 @@ _DRUGBANK_GENERICS_CACHE: Optional[set] = None
 _DRUGBANK_SYNONYMS_CACHE: Optional[Dict[str, str]] = None
 _DRUGBANK_AUTOMATON_CACHE = None
 
+# Salt suffixes stripped before comparing a name (or one part of a
+# combination) against the DrugBank generics
+SALT_SUFFIX_RX = re.compile(
+    r'\s+(HYDROCHLORIDE|HCL|SODIUM|POTASSIUM|CALCIUM|SULFATE|ACETATE|MALEATE|FUMARATE|TARTRATE|CITRATE|PHOSPHATE|CHLORIDE|BESILATE|BESYLATE|MESYLATE|TRIHYDRATE|DIHYDRATE|MONOHYDRATE)\s*$',
+    re.IGNORECASE,
+)
+COMBO_PART_SALT_SUFFIX_RX = re.compile(
+    r'\s+(HYDROCHLORIDE|HCL|SODIUM|POTASSIUM|CALCIUM|SULFATE|ACETATE|MALEATE|FUMARATE|TARTRATE|CITRATE|PHOSPHATE|CHLORIDE|BESILATE|BESYLATE|MESYLATE)\s*$',
+    re.IGNORECASE,
+)
+AS_SALT_RX = re.compile(r'^(.+?)\s+AS\s+')
+PAREN_AS_SALT_RX = re.compile(r'^(.+?)\s*\(AS\s+')
+
 
 def _load_drugbank_data() -> Tuple[set, Dict[str, str]]:
     """Load DrugBank generic names and build synonym mapping.
@@ -316,19 +335,19 @@ def _is_exact_generic_match(name: str, automaton, generics: set) -> bool:
     
     # Strip salt forms and check base name
     # e.g., "METFORMIN HYDROCHLORIDE" -> "METFORMIN"
-    base = re.sub(r'\s+(HYDROCHLORIDE|HCL|SODIUM|POTASSIUM|CALCIUM|SULFATE|ACETATE|MALEATE|FUMARATE|TARTRATE|CITRATE|PHOSPHATE|CHLORIDE|BESILATE|BESYLATE|MESYLATE|TRIHYDRATE|DIHYDRATE|MONOHYDRATE)\s*$', '', upper, flags=re.IGNORECASE)
+    base = SALT_SUFFIX_RX.sub('', upper)
     if base != upper and base in generics:
         return True
     
     # Check for "AS" salt forms (e.g., "AMLODIPINE AS BESILATE")
-    as_match = re.match(r'^(.+?)\s+AS\s+', upper)
+    as_match = AS_SALT_RX.match(upper)
     if as_match:
         base = as_match.group(1).strip()
         if base in generics:
             return True
     
     # Check for "(AS SALT)" patterns (e.g., "AMLODIPINE (AS BESILATE)")
-    paren_match = re.match(r'^(.+?)\s*\(AS\s+', upper)
+    paren_match = PAREN_AS_SALT_RX.match(upper)
     if paren_match:
         base = paren_match.group(1).strip()
         if base in generics:
@@ -340,7 +359,7 @@ def _is_exact_generic_match(name: str, automaton, generics: set) -> bool:
         parts = [p.strip() for p in upper.split("+")]
         all_generic = True
         for part in parts:
-            part_base = re.sub(r'\s+(HYDROCHLORIDE|HCL|SODIUM|POTASSIUM|CALCIUM|SULFATE|ACETATE|MALEATE|FUMARATE|TARTRATE|CITRATE|PHOSPHATE|CHLORIDE|BESILATE|BESYLATE|MESYLATE)\s*$', '', part, flags=re.IGNORECASE)
+            part_base = COMBO_PART_SALT_SUFFIX_RX.sub('', part)
             if part_base not in generics:
                 all_generic = False
                 break
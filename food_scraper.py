@@ -490,6 +490,20 @@ def _normalize_column_name(name: str) -> str:
     return clean
 
 
+def _export_field_for_column(name: str) -> Optional[str]:
+    """Map an export column header onto one of the canonical row fields."""
+    norm = _normalize_column_name(name)
+    if "registration" in norm and "number" in norm:
+        return "registration_number"
+    if "company" in norm:
+        return "company_name"
+    if "product" in norm:
+        return "product_name"
+    if "brand" in norm:
+        return "brand_name"
+    return None
+
+
 def _load_export_file(path: Path) -> List[Dict[str, str]]:
     """Load the downloaded export (CSV text) and coerce to the canonical column set."""
     try:
@@ -502,6 +516,8 @@ def _load_export_file(path: Path) -> List[Dict[str, str]]:
     if not raw_rows:
         raise RuntimeError(f"Failed to read export file {path}: empty payload")
 
+    # Every row shares the export's header, so each column is resolved once.
+    fields: Dict[Optional[str], Optional[str]] = {}
     rows: List[Dict[str, str]] = []
     for raw in raw_rows:
         mapped: Dict[str, str] = {
@@ -511,16 +527,14 @@ def _load_export_file(path: Path) -> List[Dict[str, str]]:
             "registration_number": "",
         }
         for key, value in raw.items():
-            norm = _normalize_column_name(str(key))
+            if key in fields:
+                field = fields[key]
+            else:
+                field = fields[key] = _export_field_for_column(str(key))
+            if field is None:
+                continue
             val = (value or "").strip() if isinstance(value, str) else "" if value is None else str(value).strip()
-            if "registration" in norm and "number" in norm:
-                mapped["registration_number"] = val
-            elif "company" in norm:
-                mapped["company_name"] = val
-            elif "product" in norm:
-                mapped["product_name"] = val
-            elif "brand" in norm:
-                mapped["brand_name"] = val
+            mapped[field] = val
         rows.append(mapped)
     return _dedupe_rows(rows)
 
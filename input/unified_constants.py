@@ -9,7 +9,11 @@ Sources: constants.py, combos_drugs.py, text_utils_drugs.py, routes_forms_drugs.
          generic_normalization.py, scoring.py, and debug/old_files/*.py
 """
 
-from typing import Any, Dict, List, Optional, Set, Tuple
+import functools as _functools
+import logging as _logging
+import re as _re
+import unicodedata as _unicodedata
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
 # ============================================================================
 # TOKEN CATEGORIES
@@ -36,7 +40,7 @@ DOSE_FLEXIBLE = True           # Different doses are acceptable (same ATC)
 #              GENERIC_BAD_SINGLE_TOKENS, COMMON_UNKNOWN_STOPWORDS
 # ============================================================================
 
-STOPWORDS: Set[str] = {
+STOPWORDS: FrozenSet[str] = frozenset({
     # Natural language stopwords
     "AS", "IN", "FOR", "TO", "WITH", "EQUIV", "EQUIV.", "AND", "OF", "OR",
     "NOT", "THAN", "HAS", "DURING", "THIS", "W/", "W", "PLUS", "APPROX",
@@ -93,17 +97,17 @@ STOPWORDS: Set[str] = {
     "REPLACEMENT", "RESPIRATORY", "ROSE", "SALINE", "SALT", "SALTS",
     "SERUM", "SINGLE", "SKIN", "SOFT", "SOLVENT", "SPINAL", "STANDARD",
     "STERILE", "SURGICAL", "WITHOUT", "YELLOW",
-}
+})
 
 # Lowercase version for case-insensitive matching
-STOPWORDS_LOWER: Set[str] = {s.lower() for s in STOPWORDS}
+STOPWORDS_LOWER: FrozenSet[str] = frozenset(s.lower() for s in STOPWORDS)
 
 # ============================================================================
 # FORM MODIFIER WORDS - Words that are valid drug names but should be ignored
 # when they appear as form/packaging descriptors (after CAPSULE, TABLET, etc.)
 # ============================================================================
 
-FORM_MODIFIER_IGNORE: Set[str] = {
+FORM_MODIFIER_IGNORE: FrozenSet[str] = frozenset({
     # These are real drugs but commonly appear as form descriptors
     "GELATIN",        # DB11242 - but also describes capsule shells
     "STARCH",         # DB00930 - but also excipient
@@ -117,14 +121,14 @@ FORM_MODIFIER_IGNORE: Set[str] = {
     "EFFERVESCENT", "SUBLINGUAL", "BUCCAL", "ORALLY",
     "DISINTEGRATING", "FREEZE", "DRIED", "LYOPHILIZED",
     "DEPOT", "RETARD",
-}
+})
 
 # ============================================================================
 # SALT TOKENS - Pharmaceutical salt/hydrate suffixes
 # Merged from: SALT_TOKENS (3 copies), SPECIAL_SALT_TOKENS, SALT_FORM_SUFFIXES
 # ============================================================================
 
-SALT_TOKENS: Set[str] = {
+SALT_TOKENS: FrozenSet[str] = frozenset({
     # Cation salts
     "CALCIUM", "SODIUM", "POTASSIUM", "MAGNESIUM", "ZINC", "AMMONIUM",
     "MEGLUMINE", "ALUMINUM", "ALUMINIUM", "IRON", "FERROUS", "FERRIC",
@@ -156,9 +160,9 @@ SALT_TOKENS: Set[str] = {
     
     # Release modifiers (sometimes treated as salt-like)
     "SR", "XR", "ER", "CR",
-}
+})
 
-SALT_TOKENS_LOWER: Set[str] = {s.lower() for s in SALT_TOKENS}
+SALT_TOKENS_LOWER: FrozenSet[str] = frozenset(s.lower() for s in SALT_TOKENS)
 
 # ============================================================================
 # PURE SALT COMPOUNDS - Should NOT have salt stripped
@@ -166,7 +170,7 @@ SALT_TOKENS_LOWER: Set[str] = {s.lower() for s in SALT_TOKENS}
 # Merged from: PURE_SALT_COMPOUNDS, COMPOUND_GENERICS, SALT_UNIT_SET
 # ============================================================================
 
-PURE_SALT_COMPOUNDS: Set[str] = {
+PURE_SALT_COMPOUNDS: FrozenSet[str] = frozenset({
     # Chlorides
     "SODIUM CHLORIDE", "POTASSIUM CHLORIDE", "CALCIUM CHLORIDE",
     "MAGNESIUM CHLORIDE", "ZINC CHLORIDE", "AMMONIUM CHLORIDE",
@@ -210,7 +214,7 @@ PURE_SALT_COMPOUNDS: Set[str] = {
     "POTASSIUM BROMIDE", "SODIUM FLUORIDE", "CALCIUM FLUORIDE",
     "POTASSIUM FLUORIDE", "SODIUM SELENITE", "SODIUM THIOSULFATE",
     "FERROUS FUMARATE", "ZINC OXIDE",
-}
+})
 
 # ============================================================================
 # COMPOUND SALT RECOGNITION - Cation/Anion mapping
@@ -219,14 +223,14 @@ PURE_SALT_COMPOUNDS: Set[str] = {
 # ============================================================================
 
 # Common pharmaceutical cations (positively charged ions)
-SALT_CATIONS: Set[str] = {
+SALT_CATIONS: FrozenSet[str] = frozenset({
     "SODIUM", "POTASSIUM", "CALCIUM", "MAGNESIUM", "ZINC", "IRON",
     "FERROUS", "FERRIC", "ALUMINUM", "ALUMINIUM", "AMMONIUM",
     "COPPER", "MANGANESE", "SILVER", "LITHIUM", "BARIUM",
-}
+})
 
 # Common pharmaceutical anions (negatively charged ions)
-SALT_ANIONS: Set[str] = {
+SALT_ANIONS: FrozenSet[str] = frozenset({
     # Halides
     "CHLORIDE", "BROMIDE", "IODIDE", "FLUORIDE",
     # Oxygen-containing
@@ -235,7 +239,7 @@ SALT_ANIONS: Set[str] = {
     "TARTRATE", "MALEATE", "MALATE", "OXIDE", "HYDROXIDE",
     # Other
     "SELENITE", "THIOSULFATE",
-}
+})
 
 # Map anion to all its common cation pairs (for identifying related compounds)
 ANION_TO_CATIONS: Dict[str, Set[str]] = {
@@ -258,6 +262,26 @@ ANION_TO_CATIONS: Dict[str, Set[str]] = {
 }
 
 
+# Frozen copies of the ANION_TO_CATIONS values, safe to hand out to callers
+_CATIONS_BY_ANION: Dict[str, FrozenSet[str]] = {
+    anion: frozenset(cations) for anion, cations in ANION_TO_CATIONS.items()
+}
+_NO_CATIONS: FrozenSet[str] = frozenset()
+
+
+def cations_for_anion(anion: str) -> FrozenSet[str]:
+    """Get the cations commonly paired with an anion (empty if unknown)."""
+    return _CATIONS_BY_ANION.get(anion.upper(), _NO_CATIONS)
+
+
+# Every valid "CATION ANION" name, so parse_compound_salt is one dict probe
+_COMPOUND_SALT_PAIRS: Dict[str, Tuple[str, str]] = {
+    f"{cation} {anion}": (cation, anion)
+    for cation in SALT_CATIONS
+    for anion in SALT_ANIONS
+}
+
+
 def parse_compound_salt(name: str) -> Tuple[Optional[str], Optional[str]]:
     """
     Parse a compound salt into its cation and anion components.
@@ -271,18 +295,21 @@ def parse_compound_salt(name: str) -> Tuple[Optional[str], Optional[str]]:
     Returns (cation, anion) or (None, None) if not a compound salt.
     """
     name_upper = name.upper().strip()
-    words = name_upper.split()
-    
-    if len(words) != 2:
-        return None, None
-    
-    first, second = words
-    
-    # Check if first word is cation and second is anion
-    if first in SALT_CATIONS and second in SALT_ANIONS:
-        return first, second
-    
-    return None, None
+    pair = _COMPOUND_SALT_PAIRS.get(name_upper)
+    if pair is not None:
+        return pair
+    # Names with runs of spaces or other whitespace still match once their
+    # words are re-joined
+    return _COMPOUND_SALT_PAIRS.get(" ".join(name_upper.split()), (None, None))
+
+
+# (cation, anion) → other "CATION ANION" salts sharing that anion
+_RELATED_SALTS: Dict[Tuple[str, str], FrozenSet[str]] = {
+    (cation, anion): frozenset(
+        f"{c} {anion}" for c in _CATIONS_BY_ANION.get(anion, ()) if c != cation
+    )
+    for cation, anion in _COMPOUND_SALT_PAIRS.values()
+}
 
 
 def get_related_salts(name: str) -> Set[str]:
@@ -291,20 +318,60 @@ def get_related_salts(name: str) -> Set[str]:
     
     Example:
     - "SODIUM CHLORIDE" -> {"POTASSIUM CHLORIDE", "CALCIUM CHLORIDE", ...}
-    """
-    cation, anion = parse_compound_salt(name)
     
-    if not anion:
-        return set()
-    
-    related = set()
-    related_cations = ANION_TO_CATIONS.get(anion, set())
+    Returns a new set copied from the precomputed table.
+    """
+    return set(_RELATED_SALTS.get(parse_compound_salt(name), ()))
+
+
+def _build_pure_salt_suffix_trie() -> Dict[str, Any]:
+    """Trie over the reversed words of PURE_SALT_COMPOUNDS ("" marks an end)."""
+    root: Dict[str, Any] = {}
+    for compound in PURE_SALT_COMPOUNDS:
+        node = root
+        for word in reversed(compound.split()):
+            node = node.setdefault(word, {})
+        node[""] = True
+    return root
+
+_PURE_SALT_SUFFIX_TRIE: Dict[str, Any] = _build_pure_salt_suffix_trie()
+
+
+def _pure_salt_ends_at(tokens: List[str], end: int) -> bool:
+    """True when a PURE_SALT_COMPOUND ends at tokens[end - 1]."""
+    node = _PURE_SALT_SUFFIX_TRIE
+    for i in range(end - 1, -1, -1):
+        node = node.get(tokens[i])
+        if node is None:
+            return False
+        if "" in node:
+            return True
+    return False
+
+
+def find_salt_tail(tokens: List[str]) -> int:
+    """
+    Find where the trailing salt/hydrate tokens of a name begin.
     
-    for c in related_cations:
-        if c != cation:  # Don't include self
-            related.add(f"{c} {anion}")
+    Examples:
+    - ["LOSARTAN", "POTASSIUM"] -> 1
+    - ["METFORMIN", "HCL", "SR"] -> 1
+    - ["DEXTROSE", "SODIUM", "CHLORIDE"] -> 3 (ends in a pure salt compound)
+    - ["X", "SODIUM", "CHLORIDE", "SR"] -> 3 (the compound itself is kept)
     
-    return related
+    Tokens are compared case-insensitively. Returns len(tokens) when there
+    is nothing to strip. The first token is never part of the tail.
+    """
+    tokens = [tok.upper() for tok in tokens]
+    start = len(tokens)
+    # A pure salt compound is the active ingredient: stop stripping at its end
+    while (
+        start > 1
+        and tokens[start - 1] in SALT_TOKENS
+        and not _pure_salt_ends_at(tokens, start)
+    ):
+        start -= 1
+    return start
 
 
 # ============================================================================
@@ -312,11 +379,11 @@ def get_related_salts(name: str) -> Set[str]:
 # These should be treated as generics when they appear as the main drug
 # ============================================================================
 
-ELEMENT_DRUGS: Set[str] = {
+ELEMENT_DRUGS: FrozenSet[str] = frozenset({
     "ZINC", "CALCIUM", "IRON", "MAGNESIUM", "POTASSIUM", "SODIUM",
     "COPPER", "MANGANESE", "SELENIUM", "CHROMIUM", "IODINE",
     "PHOSPHORUS", "FLUORIDE",
-}
+})
 
 # ============================================================================
 # FORM CANONICALIZATION
@@ -819,12 +886,19 @@ for _group in FORM_EQUIVALENCE_GROUPS:
     for _form in _group:
         FORM_EQUIVALENTS[_form] = _group
 
+# Form → index of its equivalence group (same last-group-wins rule as above)
+_FORM_GROUP_ID: Dict[str, int] = {
+    form: gid
+    for gid, group in enumerate(FORM_EQUIVALENCE_GROUPS)
+    for form in group
+}
+
 # ============================================================================
 # UNIT/MEASUREMENT TOKENS
 # Merged from: UNIT_TOKENS, MEASUREMENT_TOKENS, _PREFIX_UNIT_TOKENS
 # ============================================================================
 
-UNIT_TOKENS: Set[str] = {
+UNIT_TOKENS: FrozenSet[str] = frozenset({
     # Weight units
     "MG", "G", "MCG", "UG", "KG", "GMS", "GM",
     
@@ -842,9 +916,9 @@ UNIT_TOKENS: Set[str] = {
     
     # Compound units
     "MG/ML", "MCG/ML", "IU/ML", "MG/5ML", "MG/L",
-}
+})
 
-UNIT_TOKENS_LOWER: Set[str] = {u.lower() for u in UNIT_TOKENS}
+UNIT_TOKENS_LOWER: FrozenSet[str] = frozenset(u.lower() for u in UNIT_TOKENS)
 
 # Weight unit conversion factors (to mg)
 WEIGHT_UNIT_FACTORS: Dict[str, float] = {
@@ -890,22 +964,103 @@ ATC_COMBINATION_PATTERNS: List[str] = [
     "M05BB",                    # Bisphosphonates combinations
 ]
 
+
+def _bucket_atc_patterns() -> Tuple[Tuple[int, FrozenSet[str]], ...]:
+    """Group ATC_COMBINATION_PATTERNS by prefix length (shortest first)."""
+    by_len: Dict[int, Set[str]] = {}
+    for pattern in ATC_COMBINATION_PATTERNS:
+        by_len.setdefault(len(pattern), set()).add(pattern)
+    return tuple((n, frozenset(by_len[n])) for n in sorted(by_len))
+
+# (length, prefixes) buckets: one slice + set probe per distinct length
+_ATC_PATTERNS_BY_LEN: Tuple[Tuple[int, FrozenSet[str]], ...] = _bucket_atc_patterns()
+
 # ATC codes ending in these suffixes are typically combinations
-COMBINATION_ATC_SUFFIXES: Set[str] = {
+COMBINATION_ATC_SUFFIXES: FrozenSet[str] = frozenset({
     "20", "30", "50", "51", "52", "53", "54", "55", "56", "57", "58", "59"
-}
+})
 
 # ============================================================================
 # CONNECTIVE WORDS
 # Words that connect multiple ingredients in combination products
 # ============================================================================
 
-CONNECTIVE_WORDS: Set[str] = {
+CONNECTIVE_WORDS: FrozenSet[str] = frozenset({
     "AND", "WITH", "PLUS", "+", "/", "&", "IN",
-}
+})
 
 # Tokens that break salt tails (from text_utils_drugs.py)
-SALT_TAIL_BREAK_TOKENS: Set[str] = {"+", "/", "&", "AND", "WITH"}
+SALT_TAIL_BREAK_TOKENS: FrozenSet[str] = frozenset({"+", "/", "&", "AND", "WITH"})
+
+# Any connective with its surrounding whitespace; words only match whole
+CONNECTIVE_SPLIT_RX = _re.compile(
+    r"\s*(?:"
+    + "|".join(
+        _re.escape(w) if not w.isalpha() else r"\b" + w + r"\b"
+        for w in sorted(CONNECTIVE_WORDS, key=lambda w: (-len(w), w))
+    )
+    + r")\s*",
+    _re.IGNORECASE,
+)
+
+
+def split_connectives(text: str) -> List[str]:
+    """
+    Split a combination name into its parts at any CONNECTIVE_WORDS entry.
+    
+    Example: "Ibuprofen + Paracetamol" -> ["Ibuprofen", "Paracetamol"].
+    Empty parts (leading/trailing or doubled connectives) are dropped.
+    """
+    return [part for part in CONNECTIVE_SPLIT_RX.split(text.strip()) if part]
+
+# ============================================================================
+# TOKEN FLAGS
+# Bit flags for the token vocabularies above, so several category checks
+# on one token cost a single dict lookup
+# ============================================================================
+
+TOKEN_STOPWORD = 1 << 0
+TOKEN_SALT = 1 << 1
+TOKEN_UNIT = 1 << 2
+TOKEN_ELEMENT = 1 << 3
+TOKEN_CONNECTIVE = 1 << 4
+TOKEN_ANION = 1 << 5
+TOKEN_CATION = 1 << 6
+
+
+def _build_token_flags() -> Dict[str, int]:
+    """OR together the category flags of every uppercase token."""
+    flags: Dict[str, int] = {}
+    for tokens, flag in (
+        (STOPWORDS, TOKEN_STOPWORD),
+        (SALT_TOKENS, TOKEN_SALT),
+        (UNIT_TOKENS, TOKEN_UNIT),
+        (ELEMENT_DRUGS, TOKEN_ELEMENT),
+        (CONNECTIVE_WORDS, TOKEN_CONNECTIVE),
+        (SALT_ANIONS, TOKEN_ANION),
+        (SALT_CATIONS, TOKEN_CATION),
+    ):
+        for token in tokens:
+            flags[token] = flags.get(token, 0) | flag
+    return flags
+
+_TOKEN_FLAGS: Dict[str, int] = _build_token_flags()
+
+
+def token_flags(token: str) -> int:
+    """
+    Get the TOKEN_* category flags of a token (0 if it is in no category).
+    
+    Example: token_flags(tok) & (TOKEN_STOPWORD | TOKEN_UNIT) tests both
+    categories with one lookup.
+    """
+    return _TOKEN_FLAGS.get(token.upper(), 0)
+
+
+def token_flags_batch(tokens: Iterable[str]) -> List[int]:
+    """Vectorized token_flags over a column of tokens."""
+    flags_get = _TOKEN_FLAGS.get
+    return [flags_get(token.upper(), 0) for token in tokens]
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -916,6 +1071,30 @@ def get_canonical_form(form: str) -> str:
     return FORM_CANON.get(form.upper(), form.upper())
 
 
+_FORM_KEY_MAX_LEN = max(len(key) for key in FORM_CANON)
+
+
+def find_form_key(text: str) -> Optional[str]:
+    """
+    Find the longest FORM_CANON key that text starts with.
+
+    The key must end on a word boundary, so "TABLET, FILM COATED 500MG"
+    yields "TABLET, FILM COATED" but "TABASCO" does not yield "TAB".
+    Returns the uppercase key (see FORM_CANON for its canonical form), or None.
+    """
+    text_upper = text.upper()
+    best = None
+    # Keys start and end with a word character, so only the ends of word runs
+    # can close a match, and probing each one is a dict lookup per word
+    for m in _WORD_RUN_RX.finditer(text_upper, 0, _FORM_KEY_MAX_LEN + 1):
+        end = m.end()
+        if end > _FORM_KEY_MAX_LEN:
+            break
+        if text_upper[:end] in FORM_CANON:
+            best = text_upper[:end]
+    return best
+
+
 def get_canonical_route(route: str) -> str:
     """Get canonical route name, or return uppercase original if not found."""
     return ROUTE_CANON.get(route.upper(), route.upper())
@@ -923,6 +1102,9 @@ def get_canonical_route(route: str) -> str:
 
 def is_stopword(token: str) -> bool:
     """Check if token is a stopword (case-insensitive)."""
+    # STOPWORDS is upper-case ASCII, so for ASCII tokens one probe decides
+    if token.isascii():
+        return token.lower() in STOPWORDS_LOWER
     return token.upper() in STOPWORDS or token.lower() in STOPWORDS_LOWER
 
 
@@ -943,6 +1125,9 @@ def is_element_drug(token: str) -> bool:
 
 def is_unit_token(token: str) -> bool:
     """Check if token is a unit/measurement token."""
+    # UNIT_TOKENS is upper-case ASCII, so for ASCII tokens one probe decides
+    if token.isascii():
+        return token.lower() in UNIT_TOKENS_LOWER
     return token.upper() in UNIT_TOKENS or token.lower() in UNIT_TOKENS_LOWER
 
 
@@ -951,16 +1136,27 @@ def is_combination_atc(atc_code: str) -> bool:
     if not atc_code:
         return False
     atc_upper = atc_code.upper()
-    # Check pattern prefixes
-    for pattern in ATC_COMBINATION_PATTERNS:
-        if atc_upper.startswith(pattern):
-            return True
-    # Check suffix patterns (last 2 digits)
-    if len(atc_upper) >= 2:
-        suffix = atc_upper[-2:]
-        if suffix in COMBINATION_ATC_SUFFIXES:
+    # Pattern prefixes, then suffix patterns (last 2 digits)
+    for length, prefixes in _ATC_PATTERNS_BY_LEN:
+        if atc_upper[:length] in prefixes:
             return True
-    return False
+    return atc_upper[-2:] in COMBINATION_ATC_SUFFIXES
+
+
+def is_combination_atc_batch(atc_codes: Iterable[str]) -> List[bool]:
+    """Vectorized is_combination_atc for a column of ATC codes.
+
+    ATC columns repeat the same few hundred codes across thousands of rows,
+    so each distinct code is classified once and the result reused.
+    """
+    seen: Dict[str, bool] = {}
+    out: List[bool] = []
+    for code in atc_codes:
+        hit = seen.get(code)
+        if hit is None:
+            hit = seen[code] = is_combination_atc(code)
+        out.append(hit)
+    return out
 
 
 def forms_are_equivalent(form1: str, form2: str) -> bool:
@@ -969,20 +1165,68 @@ def forms_are_equivalent(form1: str, form2: str) -> bool:
     f2 = get_canonical_form(form2)
     if f1 == f2:
         return True
-    equiv_set = FORM_EQUIVALENTS.get(f1)
-    if equiv_set and f2 in equiv_set:
-        return True
-    return False
+    gid = _FORM_GROUP_ID.get(f1)
+    return gid is not None and gid == _FORM_GROUP_ID.get(f2)
+
+
+def _form_equivalence_key(form: str) -> Any:
+    """Equivalence group id of a form, or its canonical name if ungrouped."""
+    canonical = get_canonical_form(form)
+    gid = _FORM_GROUP_ID.get(canonical)
+    return canonical if gid is None else gid
+
+
+def forms_are_equivalent_batch(forms1: Iterable[str], forms2: Iterable[str]) -> List[bool]:
+    """Vectorized forms_are_equivalent over two aligned columns of forms.
+
+    Each distinct form is reduced once to a comparable key (its group id, or
+    its canonical name when ungrouped), so every row is one key compare.
+    """
+    keys: Dict[str, Any] = {}
+    out: List[bool] = []
+    for form1, form2 in zip(forms1, forms2):
+        k1 = keys.get(form1)
+        if k1 is None:
+            k1 = keys[form1] = _form_equivalence_key(form1)
+        k2 = keys.get(form2)
+        if k2 is None:
+            k2 = keys[form2] = _form_equivalence_key(form2)
+        out.append(k1 == k2)
+    return out
+
+
+def _build_form_route_lookups() -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """Build route lookups keyed by the uppercased input form.
+
+    Folds FORM_CANON canonicalization and the FORM_TO_ROUTES -> FORM_TO_ROUTE
+    fallback chain into precomputed tables so each helper is one dict probe.
+    """
+    first_route: Dict[str, str] = {}
+    all_routes: Dict[str, List[str]] = {}
+    for form in set(FORM_CANON) | set(FORM_TO_ROUTE) | set(FORM_TO_ROUTES):
+        canonical = FORM_CANON.get(form, form)
+        if canonical in FORM_TO_ROUTES:
+            routes = FORM_TO_ROUTES[canonical]
+        else:
+            single = FORM_TO_ROUTE.get(canonical) or FORM_TO_ROUTE.get(form)
+            routes = [single] if single else []
+        if routes:
+            first_route[form] = routes[0]
+            all_routes[form] = routes
+    return first_route, all_routes
+
+# Uppercased form -> most common route / all valid routes
+_FORM_TO_FIRST_ROUTE, _FORM_TO_ALL_ROUTES = _build_form_route_lookups()
+
+# Every valid (uppercased form, route) pair, for O(1) pair validation
+_VALID_FORM_ROUTE_PAIRS: FrozenSet[Tuple[str, str]] = frozenset(
+    (form, route) for form, routes in _FORM_TO_ALL_ROUTES.items() for route in routes
+)
 
 
 def infer_route_from_form(form: str) -> str | None:
     """Infer the most common route from form. Returns first (most common) route."""
-    canonical = get_canonical_form(form)
-    # Try FORM_TO_ROUTES first (more complete)
-    if canonical in FORM_TO_ROUTES:
-        return FORM_TO_ROUTES[canonical][0]
-    # Fall back to FORM_TO_ROUTE
-    return FORM_TO_ROUTE.get(canonical) or FORM_TO_ROUTE.get(form.upper())
+    return _FORM_TO_FIRST_ROUTE.get(form.upper())
 
 
 def get_valid_routes_for_form(form: str) -> List[str]:
@@ -991,21 +1235,15 @@ def get_valid_routes_for_form(form: str) -> List[str]:
     Returns list of routes ordered by frequency (most common first).
     If form not found, returns empty list.
     """
-    canonical = get_canonical_form(form)
-    if canonical in FORM_TO_ROUTES:
-        return FORM_TO_ROUTES[canonical]
-    # Fall back to single-route mapping
-    single = FORM_TO_ROUTE.get(canonical) or FORM_TO_ROUTE.get(form.upper())
-    return [single] if single else []
+    return _FORM_TO_ALL_ROUTES.get(form.upper(), [])
 
 
 def is_valid_form_route_pair(form: str, route: str) -> bool:
     """Check if a form-route combination is valid according to DrugBank data."""
-    valid_routes = get_valid_routes_for_form(form)
-    if not valid_routes:
+    form_upper = form.upper()
+    if form_upper not in _FORM_TO_ALL_ROUTES:
         return True  # Unknown form, allow any route
-    route_upper = route.upper()
-    return route_upper in valid_routes
+    return (form_upper, route.upper()) in _VALID_FORM_ROUTE_PAIRS
 
 
 # ============================================================================
@@ -1013,7 +1251,7 @@ def is_valid_form_route_pair(form: str, route: str) -> bool:
 # These are not drug names but formulation/packaging/flavor words
 # ============================================================================
 
-GARBAGE_TOKENS: Set[str] = {
+GARBAGE_TOKENS: FrozenSet[str] = frozenset({
     # Units
     'MG', 'ML', 'MCG', 'G', 'IU', 'UNIT', 'UNITS',
     # Dosage forms
@@ -1028,7 +1266,7 @@ GARBAGE_TOKENS: Set[str] = {
     'PNF', 'NAN', '-', '+', '/', 'AND', 'WITH',
     # Formulation words
     'SOLVENT', 'DILUENT', 'SOLUTION', 'SUSPENSION', 'POWDER',
-}
+})
 
 # ============================================================================
 # GENERIC SYNONYMS - Drug name synonym mappings
@@ -1236,6 +1474,70 @@ SPELLING_SYNONYMS: Dict[str, str] = {
     "VITAMIN INTRAVENOUS WATER-SOLUBLE": "VITAMIN B COMPLEX + VITAMIN C",
 }
 
+# Merge order for the resolved synonym map (first dict wins on conflicts)
+_SYNONYM_PRIORITY: Tuple[Dict[str, str], ...] = (
+    SPELLING_SYNONYMS,
+    GENERIC_SYNONYMS,
+    IV_FLUID_SYNONYMS,
+    DRUGBANK_COMPONENT_SYNONYMS,
+)
+
+# Entries dropped while building the resolved map: (name, kept, discarded)
+_SYNONYM_CONFLICTS: List[Tuple[str, str, str]] = []
+# Reverse halves of bidirectional pairs, dropped by design: (name, target)
+_SYNONYM_REVERSE_PAIRS: List[Tuple[str, str]] = []
+
+
+def _build_canonical_synonym_map() -> Dict[str, str]:
+    """Merge all synonym dicts into one acyclic name -> canonical mapping.
+
+    The bidirectional pairs (PARACETAMOL <-> ACETAMINOPHEN, GENTAMICIN <->
+    GENTAMICIN C2, ...) would loop forever if followed, so the first-declared
+    direction becomes canonical and the reverse entry is dropped. Every
+    name is then resolved to the end of its chain. Names mapped to
+    different targets by different tables keep the higher-priority target
+    and are summarised in a single debug log record.
+    """
+    direct: Dict[str, str] = {}
+    for table in _SYNONYM_PRIORITY:
+        for name, target in table.items():
+            kept = direct.get(name)
+            if kept is not None:
+                if kept != target:
+                    _SYNONYM_CONFLICTS.append((name, kept, target))
+                continue
+            # Skip entries that would close a cycle back onto this name
+            cur = target
+            while cur != name and direct.get(cur, cur) != cur:
+                cur = direct[cur]
+            if cur == name and target != name:
+                _SYNONYM_REVERSE_PAIRS.append((name, target))
+                continue
+            direct[name] = target
+
+    resolved: Dict[str, str] = {}
+    for name, target in direct.items():
+        while direct.get(target, target) != target:
+            target = direct[target]
+        resolved[name] = target
+
+    if _SYNONYM_CONFLICTS:
+        _logging.getLogger(__name__).debug(
+            "%d synonym conflicts resolved by table priority: %s",
+            len(_SYNONYM_CONFLICTS),
+            "; ".join(f"{n}: kept {k}, dropped {d}" for n, k, d in _SYNONYM_CONFLICTS),
+        )
+    return resolved
+
+# Single authoritative uppercase synonym -> canonical name lookup
+_CANONICAL_SYNONYM_MAP: Dict[str, str] = _build_canonical_synonym_map()
+
+
+def get_synonym_canonical(name: str) -> str:
+    """Resolve a drug name through all synonym tables to its canonical name."""
+    name_upper = name.upper()
+    return _CANONICAL_SYNONYM_MAP.get(name_upper, name_upper)
+
 # ============================================================================
 # VACCINE CANONICAL NAMES - Normalize vaccine descriptions to canonical form
 # Format: "canonical_name" -> list of patterns/aliases
@@ -1392,25 +1694,24 @@ def normalize_vaccine_name(text: str) -> Tuple[Optional[str], Optional[str]]:
         return None, None
     
     # Try to match against patterns
-    import re
     for canonical, info in VACCINE_CANONICAL.items():
         for pattern in info["patterns"]:
-            if pattern in text_upper or re.search(pattern, text_upper, re.IGNORECASE):
+            if pattern in text_upper or _re.search(pattern, text_upper, _re.IGNORECASE):
                 # Extract details (valency, strains, etc.)
                 details = []
                 
                 # Valency
-                valency_match = re.search(r'(\d+)-?VALENT', text_upper)
+                valency_match = _re.search(r'(\d+)-?VALENT', text_upper)
                 if valency_match:
                     details.append(f"{valency_match.group(1)}-valent")
                 
                 # Type/strain info in parentheses
-                type_match = re.search(r'\(TYPE[S]?\s+([^)]+)\)', text_upper)
+                type_match = _re.search(r'\(TYPE[S]?\s+([^)]+)\)', text_upper)
                 if type_match:
                     details.append(f"Type {type_match.group(1)}")
                 
                 # Group/serogroup
-                group_match = re.search(r'(?:GROUP|SEROGROUP)\s+([A-Z,\s\+]+?)(?:\s|$|\))', text_upper)
+                group_match = _re.search(r'(?:GROUP|SEROGROUP)\s+([A-Z,\s\+]+?)(?:\s|$|\))', text_upper)
                 if group_match:
                     details.append(f"Group {group_match.group(1).strip()}")
                 
@@ -1600,6 +1901,38 @@ VACCINE_COMPONENT_KEYWORDS: Dict[str, str] = {
     "BACILLUS CALMETTE GUERIN": "TUBERCULOSIS",
 }
 
+# Keyword scan order (longest first), sorted once at import
+_VACCINE_KEYWORDS_SORTED: Tuple[Tuple[str, str], ...] = tuple(
+    sorted(VACCINE_COMPONENT_KEYWORDS.items(), key=lambda x: -len(x[0]))
+)
+
+
+def _build_vaccine_keyword_automaton():
+    """Build an Aho-Corasick automaton over VACCINE_COMPONENT_KEYWORDS.
+
+    Each keyword carries its rank in _VACCINE_KEYWORDS_SORTED. Returns None
+    when pyahocorasick is not installed.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, (keyword, _normalized) in enumerate(_VACCINE_KEYWORDS_SORTED):
+        automaton.add_word(keyword, rank)
+    automaton.make_automaton()
+    return automaton
+
+_VACCINE_KEYWORD_AUTOMATON = _build_vaccine_keyword_automaton()
+
+# Removing a keyword leaves a space behind, which can join its neighbours
+# into a new hit, so keywords with a space are always rescanned
+_VACCINE_SPACED_KEYWORD_RANKS: FrozenSet[int] = frozenset(
+    rank for rank, (keyword, _normalized) in enumerate(_VACCINE_KEYWORDS_SORTED)
+    if " " in keyword
+)
+
+
 def _build_components_to_acronym() -> Dict[str, str]:
     """Build reverse mapping from sorted component key to acronym."""
     result = {}
@@ -1608,7 +1941,8 @@ def _build_components_to_acronym() -> Dict[str, str]:
         normalized = sorted([c.upper() for c in components])
         key = " + ".join(normalized)
         # Prefer shorter acronyms (DTP over DTP-HIB-HEPB)
-        if key not in result or len(acronym) < len(result[key]):
+        existing = result.get(key)
+        if existing is None or len(acronym) < len(existing):
             result[key] = acronym
     return result
 
@@ -1616,22 +1950,50 @@ def _build_components_to_acronym() -> Dict[str, str]:
 VACCINE_COMPONENTS_TO_ACRONYM: Dict[str, str] = _build_components_to_acronym()
 
 
+def _canonical_component_key(components: Iterable[str]) -> FrozenSet[str]:
+    """Order-independent lookup key for a collection of vaccine components."""
+    return frozenset([c.upper().strip() for c in components])
+
+# Same mapping keyed by component set, so lookups need no sort or join
+_VACCINE_COMPONENT_SET_TO_ACRONYM: Dict[FrozenSet[str], str] = {
+    _canonical_component_key(key.split(" + ")): acronym
+    for key, acronym in VACCINE_COMPONENTS_TO_ACRONYM.items()
+}
+
+
 def normalize_vaccine_components(text: str) -> List[str]:
     """
     Extract and normalize vaccine components from text.
     
     Returns a sorted list of normalized component names.
     """
-    text_upper = text.upper()
-    components = []
+    return _vaccine_components_upper(text.upper())
+
+
+def _vaccine_components_upper(text_upper: str) -> List[str]:
+    """normalize_vaccine_components() for text that is already upper-cased."""
+    keywords: Iterable[Tuple[str, str]] = _VACCINE_KEYWORDS_SORTED
+    if _VACCINE_KEYWORD_AUTOMATON is not None:
+        # One pass finds the keywords present; the loop below only needs
+        # those, plus any spaced keyword a removal could expose
+        ranks = {rank for _end, rank in _VACCINE_KEYWORD_AUTOMATON.iter(text_upper)}
+        if not ranks:
+            return []
+        keywords = [
+            _VACCINE_KEYWORDS_SORTED[rank]
+            for rank in sorted(ranks | _VACCINE_SPACED_KEYWORD_RANKS)
+        ]
+    
+    components = set()
     
     # Check for each component keyword
-    for keyword, normalized in sorted(VACCINE_COMPONENT_KEYWORDS.items(), key=lambda x: -len(x[0])):
-        if keyword in text_upper:
-            if normalized not in components:
-                components.append(normalized)
-            # Remove the keyword to avoid double-matching
-            text_upper = text_upper.replace(keyword, " ")
+    for keyword, normalized in keywords:
+        # Remove the keyword to avoid double-matching; keywords are longer
+        # than one character, so a hit always shortens the text
+        replaced = text_upper.replace(keyword, " ")
+        if len(replaced) != len(text_upper):
+            components.add(normalized)
+            text_upper = replaced
     
     return sorted(components)
 
@@ -1648,9 +2010,8 @@ def expand_vaccine_acronym(acronym: str) -> Optional[List[str]]:
     """
     acronym_upper = acronym.upper().strip()
     # Remove common suffixes
-    for suffix in [" VACCINE", "-VACCINE", "VACCINE"]:
-        if acronym_upper.endswith(suffix):
-            acronym_upper = acronym_upper[:-len(suffix)].strip()
+    for suffix in (" VACCINE", "-VACCINE", "VACCINE"):
+        acronym_upper = acronym_upper.removesuffix(suffix).strip()
     
     return VACCINE_ACRONYM_TO_COMPONENTS.get(acronym_upper)
 
@@ -1668,11 +2029,27 @@ def get_vaccine_acronym(components: List[str]) -> Optional[str]:
     if not components:
         return None
     
-    # Normalize and sort for order-independent matching
-    normalized = sorted([c.upper().strip() for c in components])
-    key = " + ".join(normalized)
+    # Order-independent matching; repeated components match no acronym
+    key = _canonical_component_key(components)
+    if len(key) != len(components):
+        return None
     
-    return VACCINE_COMPONENTS_TO_ACRONYM.get(key)
+    return _VACCINE_COMPONENT_SET_TO_ACRONYM.get(key)
+
+
+# Acronyms longest first; the lookahead reports the longest standalone acronym
+# starting at every word boundary, including ones nested inside longer matches.
+_VACCINE_ACRONYMS_LONGEST_FIRST: Tuple[str, ...] = tuple(
+    sorted(VACCINE_ACRONYM_TO_COMPONENTS.keys(), key=len, reverse=True)
+)
+_VACCINE_ACRONYM_RANK: Dict[str, int] = {
+    acronym: rank for rank, acronym in enumerate(_VACCINE_ACRONYMS_LONGEST_FIRST)
+}
+_VACCINE_ACRONYM_RX = _re.compile(
+    r"\b(?=("
+    + "|".join(_re.escape(a) for a in _VACCINE_ACRONYMS_LONGEST_FIRST)
+    + r")\b)"
+)
 
 
 def match_vaccine_text(text: str) -> Tuple[Optional[str], Optional[List[str]]]:
@@ -1691,15 +2068,18 @@ def match_vaccine_text(text: str) -> Tuple[Optional[str], Optional[List[str]]]:
     """
     text_upper = text.upper()
     
-    # Check if text starts with or contains a known acronym
-    for acronym in sorted(VACCINE_ACRONYM_TO_COMPONENTS.keys(), key=len, reverse=True):
-        # Check for acronym as standalone word
-        import re
-        if re.search(rf'\b{re.escape(acronym)}\b', text_upper):
-            return acronym, VACCINE_ACRONYM_TO_COMPONENTS[acronym]
+    # Check if text starts with or contains a known acronym (longest wins)
+    best_rank = None
+    for m in _VACCINE_ACRONYM_RX.finditer(text_upper):
+        rank = _VACCINE_ACRONYM_RANK[m.group(1)]
+        if best_rank is None or rank < best_rank:
+            best_rank = rank
+    if best_rank is not None:
+        acronym = _VACCINE_ACRONYMS_LONGEST_FIRST[best_rank]
+        return acronym, VACCINE_ACRONYM_TO_COMPONENTS[acronym]
     
     # Extract components from text
-    components = normalize_vaccine_components(text)
+    components = _vaccine_components_upper(text_upper)
     if components:
         acronym = get_vaccine_acronym(components)
         return acronym, components
@@ -1727,11 +2107,21 @@ REGIONAL_TO_US: Dict[str, str] = {v: k for k, v in REGIONAL_CANONICAL.items()}
 
 def get_regional_canonical(name: str) -> str:
     """Get the regional (PH/WHO) canonical name for a drug."""
-    return REGIONAL_CANONICAL.get(name.upper(), name.upper())
+    name_upper = name.upper()
+    return REGIONAL_CANONICAL.get(name_upper, name_upper)
 
 def get_us_canonical(name: str) -> str:
     """Get the US canonical name for a drug (for database lookups)."""
-    return REGIONAL_TO_US.get(name.upper(), name.upper())
+    name_upper = name.upper()
+    return REGIONAL_TO_US.get(name_upper, name_upper)
+
+def resolve_drug_name(name: str) -> Tuple[str, str]:
+    """Get both the regional (PH/WHO) and US canonical names in one call."""
+    name_upper = name.upper()
+    return (
+        REGIONAL_CANONICAL.get(name_upper, name_upper),
+        REGIONAL_TO_US.get(name_upper, name_upper),
+    )
 
 
 # ============================================================================
@@ -1739,7 +2129,7 @@ def get_us_canonical(name: str) -> str:
 # These should be preserved as single tokens during tokenization
 # ============================================================================
 
-MULTIWORD_GENERICS: Set[str] = {
+MULTIWORD_GENERICS: FrozenSet[str] = frozenset({
     # Acids
     "TRANEXAMIC ACID", "FOLIC ACID", "ASCORBIC ACID", "VALPROIC ACID",
     "ACETYLSALICYLIC ACID", "HYALURONIC ACID", "RETINOIC ACID",
@@ -1782,7 +2172,184 @@ MULTIWORD_GENERICS: Set[str] = {
     "INFLUENZA VACCINE", "ROTAVIRUS VACCINE", "RABIES VACCINE",
     "YELLOW FEVER VACCINE", "HPV VACCINE", "TYPHOID VACCINE",
     "JAPANESE ENCEPHALITIS VACCINE", "PENTAVALENT VACCINE",
-}
+})
+
+def _group_multiword_generics() -> Tuple[Dict[int, FrozenSet[str]], Dict[str, FrozenSet[str]]]:
+    """Group MULTIWORD_GENERICS by token count and by first token."""
+    by_len: Dict[int, Set[str]] = {}
+    by_first: Dict[str, Set[str]] = {}
+    for name in MULTIWORD_GENERICS:
+        tokens = name.split()
+        by_len.setdefault(len(tokens), set()).add(name)
+        by_first.setdefault(tokens[0], set()).add(name)
+    return (
+        {n: frozenset(names) for n, names in by_len.items()},
+        {tok: frozenset(names) for tok, names in by_first.items()},
+    )
+
+# Token count → names, and first token → names, for longest-match tokenizers
+MULTIWORD_BY_LEN, MULTIWORD_BY_FIRST = _group_multiword_generics()
+_MULTIWORD_LENGTHS_DESC: Tuple[int, ...] = tuple(sorted(MULTIWORD_BY_LEN, reverse=True))
+
+
+def match_multiword_generic(tokens: List[str], start: int = 0) -> Optional[str]:
+    """
+    Find the longest multiword generic starting at tokens[start].
+    
+    Tokens are expected in upper case. Returns the matched name (its token
+    count is len(name.split())), or None if no multiword generic starts there.
+    """
+    if start >= len(tokens) or tokens[start] not in MULTIWORD_BY_FIRST:
+        return None
+    for n in _MULTIWORD_LENGTHS_DESC:
+        if start + n <= len(tokens):
+            candidate = " ".join(tokens[start:start + n])
+            if candidate in MULTIWORD_BY_LEN[n]:
+                return candidate
+    return None
+
+
+# Phrase → kind for find_multiword; pure salt compounds win where both apply
+_MULTIWORD_HIT_KINDS: Dict[str, str] = {name: "generic" for name in MULTIWORD_GENERICS}
+_MULTIWORD_HIT_KINDS.update((name, "salt") for name in PURE_SALT_COMPOUNDS)
+
+_WORD_RUN_RX = _re.compile(r"\w+")
+
+
+def _group_hits_by_first_word() -> Dict[str, Tuple[str, ...]]:
+    """Group the find_multiword phrases by their leading word."""
+    grouped: Dict[str, List[str]] = {}
+    for name in _MULTIWORD_HIT_KINDS:
+        grouped.setdefault(_WORD_RUN_RX.match(name).group(0), []).append(name)
+    return {first: tuple(names) for first, names in grouped.items()}
+
+_MULTIWORD_HITS_BY_FIRST = _group_hits_by_first_word()
+
+
+def _build_multiword_automaton():
+    """Build an Aho-Corasick automaton over the find_multiword phrases.
+
+    Returns None when pyahocorasick is not installed.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for name, kind in _MULTIWORD_HIT_KINDS.items():
+        automaton.add_word(name, (kind, name))
+    automaton.make_automaton()
+    return automaton
+
+_MULTIWORD_AUTOMATON = _build_multiword_automaton()
+
+
+def find_multiword(text: str) -> List[Tuple[int, Tuple[str, str]]]:
+    """
+    Find every multiword generic and pure salt compound in text.
+
+    Matches whole words in the upper-cased text, overlaps included, in one
+    pass. Returns (end, (kind, name)) hits ordered by end index (inclusive,
+    as pyahocorasick reports it), longest first on ties; kind is "salt" for
+    PURE_SALT_COMPOUNDS and "generic" for the other MULTIWORD_GENERICS.
+    """
+    text_upper = text.upper()
+    last = len(text_upper) - 1
+    hits = []
+    if _MULTIWORD_AUTOMATON is not None:
+        # Every phrase starts and ends with a word character, so checking
+        # the neighbours is equivalent to the regex word boundaries
+        for end, payload in _MULTIWORD_AUTOMATON.iter(text_upper):
+            start = end - len(payload[1]) + 1
+            if start > 0 and _is_word_char(text_upper[start - 1]):
+                continue
+            if end < last and _is_word_char(text_upper[end + 1]):
+                continue
+            hits.append((end, payload))
+    else:
+        for m in _WORD_RUN_RX.finditer(text_upper):
+            start = m.start()
+            for name in _MULTIWORD_HITS_BY_FIRST.get(m.group(0), ()):
+                end = start + len(name) - 1
+                if not text_upper.startswith(name, start):
+                    continue
+                if end < last and _is_word_char(text_upper[end + 1]):
+                    continue
+                hits.append((end, (_MULTIWORD_HIT_KINDS[name], name)))
+    hits.sort(key=lambda hit: (hit[0], -len(hit[1][1])))
+    return hits
+
+
+# Multiword generics map to themselves, so synonym keys inside them are kept
+_SYNONYM_REWRITES: Dict[str, str] = {name: name for name in MULTIWORD_GENERICS}
+_SYNONYM_REWRITES.update(SPELLING_SYNONYMS)
+
+def _build_synonym_automaton():
+    """Build an Aho-Corasick automaton over the _SYNONYM_REWRITES keys.
+
+    Returns None when pyahocorasick is not installed.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for key in _SYNONYM_REWRITES:
+        automaton.add_word(key, key)
+    automaton.make_automaton()
+    return automaton
+
+_SYNONYM_AUTOMATON = _build_synonym_automaton()
+
+def _build_synonym_rewrite_rx() -> "_re.Pattern[str]":
+    """Compile the regex fallback for apply_spelling_synonyms (longest key first)."""
+    return _re.compile(
+        r"\b(?:"
+        + "|".join(_re.escape(k) for k in sorted(_SYNONYM_REWRITES, key=lambda k: (-len(k), k)))
+        + r")\b"
+    )
+
+# Regex fallback, only compiled when the automaton is unavailable
+_SYNONYM_REWRITE_RX = None if _SYNONYM_AUTOMATON is not None else _build_synonym_rewrite_rx()
+
+
+def apply_spelling_synonyms(text: str) -> str:
+    """
+    Rewrite SPELLING_SYNONYMS keys found in text to their mapped names.
+    
+    Works on the upper-cased text and matches whole words only, taking the
+    leftmost-longest non-overlapping match. Multiword generics are left
+    intact, so synonym keys inside them are not rewritten.
+    """
+    text_upper = text.upper()
+    if _SYNONYM_AUTOMATON is None:
+        return _SYNONYM_REWRITE_RX.sub(lambda m: _SYNONYM_REWRITES[m.group(0)], text_upper)
+    
+    # Every key starts and ends with an alphanumeric character, so checking
+    # the neighbours is equivalent to the regex word boundaries
+    hits = []
+    last = len(text_upper) - 1
+    for end, key in _SYNONYM_AUTOMATON.iter(text_upper):
+        start = end - len(key) + 1
+        if start > 0 and _is_word_char(text_upper[start - 1]):
+            continue
+        if end < last and _is_word_char(text_upper[end + 1]):
+            continue
+        hits.append((start, -len(key), key))
+    if not hits:
+        return text_upper
+    
+    hits.sort()
+    parts = []
+    pos = 0
+    for start, neg_length, key in hits:
+        if start < pos:
+            continue
+        parts.append(text_upper[pos:start])
+        parts.append(_SYNONYM_REWRITES[key])
+        pos = start - neg_length
+    parts.append(text_upper[pos:])
+    return "".join(parts)
 
 
 # ============================================================================
@@ -1790,17 +2357,64 @@ MULTIWORD_GENERICS: Set[str] = {
 # These are included here so submodules only need to import unified_constants.py
 # ============================================================================
 
-import re as _re
-import unicodedata as _unicodedata
+# Pre-compiled patterns for normalize_text. Each fuses substitutions that do
+# not interact, so one scan replaces several re.sub passes without changing
+# the result of applying them in sequence.
+_IV_OR_JUNK_RX = _re.compile(r"(?P<iv>\biv\b)|[^\w%/+\.\- ]+")
+_CC_OR_GM_RX = _re.compile(r"(?<![a-z])(?:(?P<cc>cc)|gms?)(?![a-z])")
+
+
+def _iv_or_junk_repl(m: "_re.Match[str]") -> str:
+    return "intravenous" if m.lastgroup == "iv" else " "
+
+
+def _cc_or_gm_repl(m: "_re.Match[str]") -> str:
+    return "ml" if m.lastgroup == "cc" else "g"
 
-# Pre-compiled patterns for normalize_text
-_GM_TOKEN_RX = _re.compile(r"(?<![a-z])gms?(?![a-z])")
 
 # Lowercase form words for matching (sorted by length, longest first)
 _FORM_WORDS_LOWER = sorted(
     {k.lower() for k in FORM_TO_ROUTE.keys()},
-    key=len, reverse=True
+    key=lambda w: (-len(w), w)
 )
+_FORM_WORD_RANK: Dict[str, int] = {fw: i for i, fw in enumerate(_FORM_WORDS_LOWER)}
+
+def _build_form_word_automaton():
+    """Build an Aho-Corasick automaton over _FORM_WORDS_LOWER.
+
+    Every form word starts and ends with an alphanumeric character, so a hit
+    sits on word boundaries exactly when its neighbours are not word
+    characters. Returns None when pyahocorasick is not installed.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, fw in enumerate(_FORM_WORDS_LOWER):
+        automaton.add_word(fw, (rank, len(fw)))
+    automaton.make_automaton()
+    return automaton
+
+_FORM_WORD_AUTOMATON = _build_form_word_automaton()
+
+def _build_form_words_rx() -> "_re.Pattern[str]":
+    """Compile the regex fallback for parse_form_from_text.
+
+    The lookahead reports the longest form word starting at every word
+    boundary, so one finditer pass sees every candidate the per-word loop did.
+    """
+    return _re.compile(
+        r"\b(?=(" + "|".join(_re.escape(fw) for fw in _FORM_WORDS_LOWER) + r")\b)"
+    )
+
+# Regex fallback, only compiled when the automaton is unavailable
+_FORM_WORDS_RX = None if _FORM_WORD_AUTOMATON is not None else _build_form_words_rx()
+
+
+def _is_word_char(c: str) -> bool:
+    """True for characters the regex word class matches in str patterns."""
+    return c.isalnum() or c == "_"
 
 def normalize_text(s: str) -> str:
     """
@@ -1808,23 +2422,56 @@ def normalize_text(s: str) -> str:
     
     This is the standard text normalization function used across the pipeline.
     Converts to lowercase, normalizes unicode, expands abbreviations, etc.
+    Results are memoized, since the same product names recur across rows.
     """
     if not isinstance(s, str):
         return ""
-    s = _unicodedata.normalize("NFKD", s)
-    s = "".join(c for c in s if not _unicodedata.combining(c))
+    return _normalize_text_impl(s)
+
+@_functools.lru_cache(maxsize=65536)
+def _normalize_text_impl(s: str) -> str:
+    """Uncached body of normalize_text(); expects a str."""
+    # ASCII is already NFKD-normal and has no combining marks
+    if not s.isascii():
+        s = _unicodedata.normalize("NFKD", s)
+        if not s.isascii():
+            s = "".join(c for c in s if not _unicodedata.combining(c))
     s = s.lower()
-    s = _re.sub(r"\biv\b", "intravenous", s)
-    s = _re.sub(r"[^\w%/+\.\- ]+", " ", s)
-    s = s.replace("microgram", "mcg").replace("μg", "mcg").replace("µg", "mcg")
-    s = _re.sub(r"(?<![a-z])cc(?![a-z])", "ml", s).replace("milli litre", "ml").replace("milliliter", "ml")
-    s = _GM_TOKEN_RX.sub("g", s)
+    s = _IV_OR_JUNK_RX.sub(_iv_or_junk_repl, s)
+    s = s.replace("microgram", "mcg")
+    if not s.isascii():
+        # NFKD has already folded the micro sign (U+00B5) into Greek mu
+        s = s.replace("μg", "mcg")
+    s = _CC_OR_GM_RX.sub(_cc_or_gm_repl, s)
+    s = s.replace("milli litre", "ml").replace("milliliter", "ml")
     s = s.replace("milligram", "mg")
     s = s.replace("polymixin", "polymyxin")
     s = s.replace("hydrochlorde", "hydrochloride")
-    s = _re.sub(r"\s+", " ", s).strip()
+    # Only plain spaces survive the junk pass, so split() collapses them all;
+    # most strings have no run or edge space and are returned as they are
+    if "  " in s or s.startswith(" ") or s.endswith(" "):
+        return " ".join(s.split())
     return s
 
+def normalize_text_batch(texts: Iterable[str]) -> List[str]:
+    """
+    Vectorized normalize_text over a column of strings.
+
+    Each distinct value is normalized once; repeated values reuse the result.
+    """
+    done: Dict[Any, str] = {}
+    out: List[str] = []
+    for s in texts:
+        try:
+            result = done.get(s)
+        except TypeError:
+            result = ""
+        if result is None:
+            result = done[s] = normalize_text(s)
+        out.append(result)
+    return out
+
+@_functools.lru_cache(maxsize=65536)
 def parse_form_from_text(s_norm: str) -> str | None:
     """
     Extract a recognized dosage form keyword from normalized text.
@@ -1835,10 +2482,25 @@ def parse_form_from_text(s_norm: str) -> str | None:
     Returns:
         The first matching form keyword, or None if not found.
     """
-    for fw in _FORM_WORDS_LOWER:
-        if _re.search(rf"\b{_re.escape(fw)}\b", s_norm):
-            return fw
-    return None
+    best_rank = None
+    if _FORM_WORD_AUTOMATON is not None:
+        last = len(s_norm) - 1
+        for end, (rank, length) in _FORM_WORD_AUTOMATON.iter(s_norm):
+            if best_rank is not None and rank >= best_rank:
+                continue
+            start = end - length + 1
+            if start > 0 and _is_word_char(s_norm[start - 1]):
+                continue
+            if end < last and _is_word_char(s_norm[end + 1]):
+                continue
+            best_rank = rank
+        return None if best_rank is None else _FORM_WORDS_LOWER[best_rank]
+    
+    for m in _FORM_WORDS_RX.finditer(s_norm):
+        rank = _FORM_WORD_RANK[m.group(1)]
+        if best_rank is None or rank < best_rank:
+            best_rank = rank
+    return None if best_rank is None else _FORM_WORDS_LOWER[best_rank]
 
 
 # ============================================================================
@@ -2017,6 +2679,49 @@ CANONICAL_ATC_MAPPINGS: List[Dict[str, Any]] = [
 ]
 
 
+def _first_index(keys: Iterable[Any]) -> Dict[Any, int]:
+    """Map each key to the index of its first occurrence."""
+    result: Dict[Any, int] = {}
+    for i, key in enumerate(keys):
+        result.setdefault(key, i)
+    return result
+
+# Column views of the canonical tables plus O(1) indexes, so lookups by name
+# do not scan the list of row dicts
+_CANONICAL_GENERIC_NAMES: Tuple[str, ...] = tuple(r["generic_name"] for r in CANONICAL_GENERICS)
+_CANONICAL_GENERIC_NAME_IDX: Dict[str, int] = _first_index(_CANONICAL_GENERIC_NAMES)
+
+_CANONICAL_ATC_NAMES: Tuple[str, ...] = tuple(r["generic_name"] for r in CANONICAL_ATC_MAPPINGS)
+_CANONICAL_ATC_DRUGBANK_IDS: Tuple[Optional[str], ...] = tuple(
+    r["drugbank_id"] for r in CANONICAL_ATC_MAPPINGS
+)
+_CANONICAL_ATC_CODES: Tuple[str, ...] = tuple(r["atc_code"] for r in CANONICAL_ATC_MAPPINGS)
+_CANONICAL_ATC_NAME_IDX: Dict[str, int] = _first_index(_CANONICAL_ATC_NAMES)
+_CANONICAL_ATC_KEY_IDX: Dict[Tuple[Optional[str], str], int] = _first_index(
+    zip(_CANONICAL_ATC_DRUGBANK_IDS, _CANONICAL_ATC_NAMES)
+)
+
+
+def get_canonical_generic(name: str) -> Optional[Dict[str, Any]]:
+    """Get the CANONICAL_GENERICS entry for a generic name, or None."""
+    idx = _CANONICAL_GENERIC_NAME_IDX.get(name.upper())
+    return None if idx is None else CANONICAL_GENERICS[idx]
+
+
+def get_canonical_atc_code(name: str, drugbank_id: Optional[str] = None) -> Optional[str]:
+    """
+    Get the canonical ATC code for a generic name.
+    
+    When drugbank_id is given, only the mapping for that (drugbank_id, name)
+    pair is considered.
+    """
+    if drugbank_id is None:
+        idx = _CANONICAL_ATC_NAME_IDX.get(name.upper())
+    else:
+        idx = _CANONICAL_ATC_KEY_IDX.get((drugbank_id, name.upper()))
+    return None if idx is None else _CANONICAL_ATC_CODES[idx]
+
+
 # ============================================================================
 # EXPORTS
 # ============================================================================
@@ -2036,7 +2741,11 @@ __all__ = [
     "SALT_CATIONS", "SALT_ANIONS", "ANION_TO_CATIONS",
     "ELEMENT_DRUGS",
     "UNIT_TOKENS", "UNIT_TOKENS_LOWER",
-    "CONNECTIVE_WORDS", "SALT_TAIL_BREAK_TOKENS",
+    "CONNECTIVE_WORDS", "SALT_TAIL_BREAK_TOKENS", "CONNECTIVE_SPLIT_RX", "split_connectives",
+    
+    # Token category flags
+    "TOKEN_STOPWORD", "TOKEN_SALT", "TOKEN_UNIT", "TOKEN_ELEMENT",
+    "TOKEN_CONNECTIVE", "TOKEN_ANION", "TOKEN_CATION", "token_flags", "token_flags_batch",
     
     # Mappings
     "FORM_CANON", "ROUTE_CANON", "FORM_TO_ROUTE", "FORM_TO_ROUTES",
@@ -2051,8 +2760,11 @@ __all__ = [
     "GENERIC_SYNONYMS", "IV_FLUID_SYNONYMS", "DRUGBANK_COMPONENT_SYNONYMS",
     "ALL_DRUG_SYNONYMS",
     "SPELLING_SYNONYMS", "MULTIWORD_GENERICS",
+    "MULTIWORD_BY_LEN", "MULTIWORD_BY_FIRST", "match_multiword_generic", "find_multiword",
     "REGIONAL_CANONICAL", "REGIONAL_TO_US",
-    "get_regional_canonical", "get_us_canonical",
+    "get_regional_canonical", "get_us_canonical", "resolve_drug_name",
+    "get_synonym_canonical",
+    "apply_spelling_synonyms",
     
     # Vaccine normalization
     "VACCINE_CANONICAL", "normalize_vaccine_name",
@@ -2063,16 +2775,19 @@ __all__ = [
     "get_vaccine_acronym", "match_vaccine_text",
     
     # Helper functions
-    "get_canonical_form", "get_canonical_route",
+    "get_canonical_form", "get_canonical_route", "find_form_key",
     "is_stopword", "is_salt_token", "is_pure_salt_compound",
     "is_element_drug", "is_unit_token", "is_combination_atc",
-    "forms_are_equivalent", "infer_route_from_form",
+    "is_combination_atc_batch",
+    "forms_are_equivalent", "forms_are_equivalent_batch", "infer_route_from_form",
     "get_valid_routes_for_form", "is_valid_form_route_pair",
-    "parse_compound_salt", "get_related_salts",
+    "parse_compound_salt", "get_related_salts", "find_salt_tail",
+    "cations_for_anion",
     
     # Text utilities (for submodules)
-    "normalize_text", "parse_form_from_text",
+    "normalize_text", "normalize_text_batch", "parse_form_from_text",
     
     # Canonical generics and ATC mappings
     "CANONICAL_GENERICS", "CANONICAL_ATC_MAPPINGS",
+    "get_canonical_generic", "get_canonical_atc_code",
 ]
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -10,6 +11,11 @@ from pathlib import Path
 
 def main() -> None:
     req_file = Path(__file__).resolve().with_name("requirements.txt")
+    uv = shutil.which("uv")
+    if uv:
+        # uv resolves and installs much faster; target this interpreter explicitly
+        subprocess.run([uv, "pip", "install", "--python", sys.executable, "-r", str(req_file)], check=True)
+        return
     subprocess.run([sys.executable, "-m", "pip", "install", "-r", str(req_file)], check=True)
 
 
@@ -0,0 +1,396 @@
+"""Tests for the helpers in input/unified_constants.py."""
+
+import sys
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "input"))
+
+import unified_constants as uc  # noqa: E402
+
+
+class IsCombinationAtcBatchTests(unittest.TestCase):
+    def test_matches_single_code_helper(self):
+        codes = ["J01CR02", "N02BE01", "j01cr02", "", "N02BE51"]
+        self.assertEqual(uc.is_combination_atc_batch(codes), [True, False, True, False, True])
+        self.assertEqual(
+            uc.is_combination_atc_batch(codes), [uc.is_combination_atc(c) for c in codes]
+        )
+
+    def test_empty_batch(self):
+        self.assertEqual(uc.is_combination_atc_batch([]), [])
+
+
+class SynonymCanonicalTests(unittest.TestCase):
+    def test_resolves_names(self):
+        self.assertEqual(uc.get_synonym_canonical("acetaminophen"), "PARACETAMOL")
+        self.assertEqual(uc.get_synonym_canonical("paracetamol"), "PARACETAMOL")
+        self.assertEqual(uc.get_synonym_canonical("d5"), "DEXTROSE")
+        self.assertEqual(uc.get_synonym_canonical("unknownx"), "UNKNOWNX")
+
+    def test_map_is_acyclic_and_resolved(self):
+        for name, canonical in uc._CANONICAL_SYNONYM_MAP.items():
+            self.assertEqual(uc.get_synonym_canonical(canonical), canonical, name)
+
+    def test_reverse_pairs_are_not_conflicts(self):
+        reverse = {name for name, _target in uc._SYNONYM_REVERSE_PAIRS}
+        self.assertIn("ACETAMINOPHEN", reverse | {
+            target for _name, target in uc._SYNONYM_REVERSE_PAIRS
+        })
+        self.assertFalse(reverse & {name for name, _kept, _dropped in uc._SYNONYM_CONFLICTS})
+
+
+class CanonicalIndexTests(unittest.TestCase):
+    def test_get_canonical_generic(self):
+        entry = uc.get_canonical_generic("amoxicillin + clavulanic acid")
+        self.assertEqual(entry["drugbank_id"], "DB00766")
+        self.assertIsNone(uc.get_canonical_generic("zzz"))
+
+    def test_get_canonical_atc_code(self):
+        self.assertEqual(uc.get_canonical_atc_code("amoxicillin + clavulanic acid"), "J01CR02")
+        self.assertEqual(
+            uc.get_canonical_atc_code("AMOXICILLIN + CLAVULANIC ACID", "DB00766"), "J01CR02"
+        )
+        self.assertIsNone(uc.get_canonical_atc_code("AMOXICILLIN + CLAVULANIC ACID", "DBX"))
+        self.assertIsNone(uc.get_canonical_atc_code("zzz"))
+
+
+class MatchMultiwordGenericTests(unittest.TestCase):
+    def test_longest_match_at_start(self):
+        self.assertEqual(
+            uc.match_multiword_generic(["ISOSORBIDE", "MONONITRATE", "20MG"]),
+            "ISOSORBIDE MONONITRATE",
+        )
+        self.assertEqual(
+            uc.match_multiword_generic(["LACTATED", "RINGER'S", "SOLUTION"]),
+            "LACTATED RINGER'S SOLUTION",
+        )
+        self.assertEqual(uc.match_multiword_generic(["X", "VITAMIN", "B12"], 1), "VITAMIN B12")
+
+    def test_no_match(self):
+        self.assertIsNone(uc.match_multiword_generic(["VITAMIN"]))
+        self.assertIsNone(uc.match_multiword_generic(["PARACETAMOL", "500MG"]))
+        self.assertIsNone(uc.match_multiword_generic(["A"], 3))
+
+
+class ResolveDrugNameTests(unittest.TestCase):
+    def test_both_directions(self):
+        self.assertEqual(uc.resolve_drug_name("acetaminophen"), ("PARACETAMOL", "ACETAMINOPHEN"))
+        self.assertEqual(uc.resolve_drug_name("Paracetamol"), ("PARACETAMOL", "ACETAMINOPHEN"))
+        self.assertEqual(
+            uc.resolve_drug_name("Paracetamol"),
+            (uc.get_regional_canonical("Paracetamol"), uc.get_us_canonical("Paracetamol")),
+        )
+
+    def test_unknown_name(self):
+        self.assertEqual(uc.resolve_drug_name("zzz"), ("ZZZ", "ZZZ"))
+
+
+class ApplySpellingSynonymsTests(unittest.TestCase):
+    def test_rewrites_whole_words(self):
+        self.assertEqual(
+            uc.apply_spelling_synonyms("aspirin 80mg + co-amoxiclav; lactated ringer's solution 1L"),
+            "ACETYLSALICYLIC ACID 80MG + AMOXICILLIN + CLAVULANIC ACID; "
+            "RINGER'S SOLUTION, LACTATED 1L",
+        )
+        self.assertEqual(uc.apply_spelling_synonyms("NSS 1L"), "SODIUM CHLORIDE 1L")
+
+    def test_leaves_other_text_alone(self):
+        self.assertEqual(uc.apply_spelling_synonyms("paracetamol"), "PARACETAMOL")
+        self.assertEqual(uc.apply_spelling_synonyms("aspirinx"), "ASPIRINX")
+        self.assertEqual(uc.apply_spelling_synonyms(""), "")
+
+
+class RelatedSaltsTests(unittest.TestCase):
+    def test_siblings_share_the_anion(self):
+        related = uc.get_related_salts("potassium chloride")
+        self.assertIsInstance(related, set)
+        self.assertIn("SODIUM CHLORIDE", related)
+        self.assertNotIn("POTASSIUM CHLORIDE", related)
+        self.assertEqual(uc.get_related_salts("paracetamol"), set())
+
+    def test_returns_a_fresh_set(self):
+        related = uc.get_related_salts("potassium chloride")
+        related.add("X")
+        self.assertNotIn("X", uc.get_related_salts("potassium chloride"))
+        missing = uc.get_related_salts("paracetamol")
+        missing.add("X")
+        self.assertEqual(uc.get_related_salts("paracetamol"), set())
+
+
+class TokenFlagsTests(unittest.TestCase):
+    def test_combines_categories(self):
+        self.assertEqual(
+            uc.token_flags("sodium"),
+            uc.TOKEN_SALT | uc.TOKEN_ELEMENT | uc.TOKEN_CATION,
+        )
+        self.assertEqual(uc.token_flags("mg"), uc.TOKEN_UNIT)
+        self.assertEqual(uc.token_flags("and"), uc.TOKEN_STOPWORD | uc.TOKEN_CONNECTIVE)
+        self.assertEqual(uc.token_flags("chloride") & uc.TOKEN_ANION, uc.TOKEN_ANION)
+
+    def test_unknown_token(self):
+        self.assertEqual(uc.token_flags("xyz"), 0)
+
+
+class FindSaltTailTests(unittest.TestCase):
+    def test_strips_trailing_salt_tokens(self):
+        self.assertEqual(uc.find_salt_tail(["LOSARTAN", "POTASSIUM"]), 1)
+        self.assertEqual(uc.find_salt_tail(["METFORMIN", "HCL", "SR"]), 1)
+
+    def test_keeps_terminal_pure_compound(self):
+        self.assertEqual(uc.find_salt_tail(["DEXTROSE", "SODIUM", "CHLORIDE"]), 3)
+        self.assertEqual(uc.find_salt_tail(["SODIUM", "CHLORIDE"]), 2)
+
+    def test_keeps_non_terminal_pure_compound(self):
+        self.assertEqual(uc.find_salt_tail(["X", "SODIUM", "CHLORIDE", "SR"]), 3)
+
+    def test_lowercase_tokens(self):
+        self.assertEqual(uc.find_salt_tail(["losartan", "potassium"]), 1)
+        self.assertEqual(uc.find_salt_tail(["x", "sodium", "chloride", "sr"]), 3)
+
+    def test_nothing_to_strip(self):
+        self.assertEqual(uc.find_salt_tail(["PARACETAMOL"]), 1)
+        self.assertEqual(uc.find_salt_tail([]), 0)
+
+
+class FormsAreEquivalentBatchTests(unittest.TestCase):
+    def test_matches_pairwise_helper(self):
+        forms1 = ["TAB", "tablet", "CAPSULE", "syrup"]
+        forms2 = ["TABLET", "FC TAB", "TABLET", "INJECTION"]
+        self.assertEqual(uc.forms_are_equivalent_batch(forms1, forms2), [True, False, True, False])
+        self.assertEqual(
+            uc.forms_are_equivalent_batch(forms1, forms2),
+            [uc.forms_are_equivalent(a, b) for a, b in zip(forms1, forms2)],
+        )
+
+    def test_empty_columns(self):
+        self.assertEqual(uc.forms_are_equivalent_batch([], []), [])
+
+
+class CationsForAnionTests(unittest.TestCase):
+    def test_known_anion(self):
+        self.assertEqual(
+            uc.cations_for_anion("chloride"),
+            frozenset({"AMMONIUM", "CALCIUM", "MAGNESIUM", "POTASSIUM", "SODIUM", "ZINC"}),
+        )
+
+    def test_unknown_anion(self):
+        self.assertEqual(uc.cations_for_anion("xx"), frozenset())
+
+
+class FindMultiwordTests(unittest.TestCase):
+    def test_reports_hits_by_end_index(self):
+        self.assertEqual(
+            uc.find_multiword("dextrose in sodium chloride 0.9% and folic acid"),
+            [(26, ("salt", "SODIUM CHLORIDE")), (46, ("generic", "FOLIC ACID"))],
+        )
+        self.assertEqual(uc.find_multiword("vitamin b12"), [(10, ("generic", "VITAMIN B12"))])
+
+    def test_whole_words_only(self):
+        self.assertEqual(uc.find_multiword("SODIUM CHLORIDES"), [])
+        self.assertEqual(uc.find_multiword(""), [])
+
+
+class NormalizeTextBatchTests(unittest.TestCase):
+    def test_matches_single_value_helper(self):
+        texts = ["Paracetamol 500 MG Tab", None, 5, "Paracetamol 500 MG Tab", "IV  5cc"]
+        self.assertEqual(
+            uc.normalize_text_batch(texts),
+            ["paracetamol 500 mg tab", "", "", "paracetamol 500 mg tab", "intravenous 5ml"],
+        )
+        self.assertEqual(uc.normalize_text_batch(texts), [uc.normalize_text(t) for t in texts])
+
+    def test_unhashable_value(self):
+        self.assertEqual(uc.normalize_text_batch([["x"]]), [""])
+
+
+class FindFormKeyTests(unittest.TestCase):
+    def test_longest_key_on_word_boundary(self):
+        self.assertEqual(uc.find_form_key("TABLET, FILM COATED 500MG"), "TABLET, FILM COATED")
+        self.assertEqual(uc.find_form_key("tab 500mg"), "TAB")
+        self.assertEqual(uc.find_form_key("capsule"), "CAPSULE")
+
+    def test_no_key(self):
+        self.assertIsNone(uc.find_form_key("tabasco"))
+        self.assertIsNone(uc.find_form_key(""))
+
+
+class TokenFlagsBatchTests(unittest.TestCase):
+    def test_matches_single_token_helper(self):
+        tokens = ["Zinc", "hcl", "of", "zz"]
+        self.assertEqual(
+            uc.token_flags_batch(tokens),
+            [
+                uc.TOKEN_SALT | uc.TOKEN_ELEMENT | uc.TOKEN_CATION,
+                uc.TOKEN_SALT,
+                uc.TOKEN_STOPWORD,
+                0,
+            ],
+        )
+        self.assertEqual(uc.token_flags_batch(tokens), [uc.token_flags(t) for t in tokens])
+
+
+class SplitConnectivesTests(unittest.TestCase):
+    def test_splits_on_connectives(self):
+        self.assertEqual(uc.split_connectives("Ibuprofen + Paracetamol"), ["Ibuprofen", "Paracetamol"])
+        self.assertEqual(
+            uc.split_connectives("Amoxicillin and Clavulanic Acid"),
+            ["Amoxicillin", "Clavulanic Acid"],
+        )
+        self.assertEqual(uc.split_connectives(" + A / B + "), ["A", "B"])
+
+    def test_words_match_whole(self):
+        self.assertEqual(uc.split_connectives("INSULIN ISOPHANE"), ["INSULIN ISOPHANE"])
+        self.assertEqual(uc.split_connectives("SANDOSTATIN"), ["SANDOSTATIN"])
+
+
+class ParseFormFromTextTests(unittest.TestCase):
+    def setUp(self):
+        uc.parse_form_from_text.cache_clear()
+        self.addCleanup(uc.parse_form_from_text.cache_clear)
+
+    def test_highest_ranked_form_word(self):
+        self.assertEqual(uc.parse_form_from_text("paracetamol 500 mg tablet"), "tablet")
+        self.assertEqual(
+            uc.parse_form_from_text("amoxicillin oral suspension 250mg/5ml"), "suspension"
+        )
+
+    def test_whole_words_only(self):
+        self.assertIsNone(uc.parse_form_from_text("tablets"))
+        self.assertIsNone(uc.parse_form_from_text("nothing here"))
+
+
+class NormalizeVaccineComponentsTests(unittest.TestCase):
+    def test_sorted_components(self):
+        self.assertEqual(
+            uc.normalize_vaccine_components("Diphtheria, Tetanus, Pertussis vaccine"),
+            ["DIPHTHERIA", "PERTUSSIS", "TETANUS"],
+        )
+        self.assertEqual(
+            uc.normalize_vaccine_components("measles mumps rubella"),
+            ["MEASLES", "MUMPS", "RUBELLA"],
+        )
+
+    def test_glued_keywords(self):
+        # Removing PNEUMOCOCCAL joins ORAL and POLIO into the ORAL POLIO keyword
+        self.assertEqual(
+            uc.normalize_vaccine_components("ORALPNEUMOCOCCALPOLIO"),
+            ["ORAL POLIO", "PNEUMOCOCCAL"],
+        )
+
+    def test_no_components(self):
+        self.assertEqual(uc.normalize_vaccine_components("paracetamol"), [])
+
+
+class _FakeAutomaton:
+    """Pure-Python stand-in for ahocorasick.Automaton.
+
+    iter() yields (end_index, value) for every occurrence of every word,
+    ordered by end index and longest word first on ties, like pyahocorasick.
+    """
+
+    def __init__(self):
+        self._words = {}
+
+    def add_word(self, key, value):
+        self._words[key] = value
+
+    def make_automaton(self):
+        pass
+
+    def iter(self, text):
+        hits = []
+        for key, value in self._words.items():
+            start = text.find(key)
+            while start != -1:
+                hits.append((start + len(key) - 1, -len(key), value))
+                start = text.find(key, start + 1)
+        hits.sort(key=lambda hit: hit[:2])
+        return [(end, value) for end, _neg_length, value in hits]
+
+
+def _build_fake_automata():
+    """Run the module's automaton builders against _FakeAutomaton."""
+    fake = types.ModuleType("ahocorasick")
+    fake.Automaton = _FakeAutomaton
+    with mock.patch.dict(sys.modules, {"ahocorasick": fake}):
+        return {
+            "_FORM_WORD_AUTOMATON": uc._build_form_word_automaton(),
+            "_SYNONYM_AUTOMATON": uc._build_synonym_automaton(),
+            "_MULTIWORD_AUTOMATON": uc._build_multiword_automaton(),
+            "_VACCINE_KEYWORD_AUTOMATON": uc._build_vaccine_keyword_automaton(),
+        }
+
+
+_FAKE_AUTOMATA = _build_fake_automata()
+
+
+class _PatchedPath:
+    """Mixin that re-runs a test case with module attributes patched."""
+
+    def patched_attributes(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        for name, value in self.patched_attributes().items():
+            patcher = mock.patch.object(uc, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        uc.parse_form_from_text.cache_clear()
+        self.addCleanup(uc.parse_form_from_text.cache_clear)
+        super().setUp()
+
+
+class _AutomatonPath(_PatchedPath):
+    def patched_attributes(self):
+        return dict(_FAKE_AUTOMATA, _SYNONYM_REWRITE_RX=None, _FORM_WORDS_RX=None)
+
+
+class _RegexFallbackPath(_PatchedPath):
+    def patched_attributes(self):
+        attributes = dict.fromkeys(_FAKE_AUTOMATA)
+        attributes["_SYNONYM_REWRITE_RX"] = uc._build_synonym_rewrite_rx()
+        attributes["_FORM_WORDS_RX"] = uc._build_form_words_rx()
+        return attributes
+
+
+class FindMultiwordAutomatonPathTests(_AutomatonPath, FindMultiwordTests):
+    pass
+
+
+class FindMultiwordRegexFallbackPathTests(_RegexFallbackPath, FindMultiwordTests):
+    pass
+
+
+class ApplySpellingSynonymsAutomatonPathTests(_AutomatonPath, ApplySpellingSynonymsTests):
+    pass
+
+
+class ApplySpellingSynonymsRegexFallbackPathTests(_RegexFallbackPath, ApplySpellingSynonymsTests):
+    pass
+
+
+class ParseFormFromTextAutomatonPathTests(_AutomatonPath, ParseFormFromTextTests):
+    pass
+
+
+class ParseFormFromTextRegexFallbackPathTests(_RegexFallbackPath, ParseFormFromTextTests):
+    pass
+
+
+class NormalizeVaccineComponentsAutomatonPathTests(
+    _AutomatonPath, NormalizeVaccineComponentsTests
+):
+    pass
+
+
+class NormalizeVaccineComponentsRegexFallbackPathTests(
+    _RegexFallbackPath, NormalizeVaccineComponentsTests
+):
+    pass
+
+
+if __name__ == "__main__":
+    unittest.main()